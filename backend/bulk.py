@@ -0,0 +1,205 @@
+"""Streaming bulk export and batched bulk import for users, items and orders.
+
+    python -m backend.bulk export items --format csv > items.csv
+    python -m backend.bulk import items items.ndjson --batch-size 5000
+"""
+import argparse
+import csv
+import enum
+import io
+import json
+import sys
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List
+from sqlalchemy import select
+from sqlmodel import Session
+from backend.catalog import record_catalog_change
+from backend.db import reset_counter
+from backend.models import Item, Order, User
+from backend.stats import record_items_imported, record_orders_imported
+
+RESOURCES = {"users": User, "items": Item, "orders": Order}
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+# Never leaves the database through an export
+EXPORT_EXCLUDE = {"users": {"hashed_password"}}
+FETCH_SIZE = 1000
+
+
+def _table(resource: str):
+    try:
+        return RESOURCES[resource].__table__
+    except KeyError:
+        raise ValueError(f"Unknown resource '{resource}'. Choose from: {', '.join(RESOURCES)}")
+
+
+def export_columns(resource: str) -> List[str]:
+    excluded = EXPORT_EXCLUDE.get(resource, set())
+    return [column.name for column in _table(resource).columns if column.name not in excluded]
+
+
+# --- EXPORT ---
+def iter_rows(engine, resource: str) -> Iterator[tuple]:
+    """Yield rows in primary-key order, FETCH_SIZE at a time.
+
+    Each page is read in its own short transaction (keyset pagination on the
+    primary key) and the connection is released before the page is yielded,
+    so a slow consumer never holds a read lock that blocks writers.
+    """
+    table = _table(resource)
+    names = export_columns(resource)
+    (key,) = table.primary_key.columns
+    key_index = names.index(key.name)
+    query = select(*(table.c[name] for name in names)).order_by(key).limit(FETCH_SIZE)
+    last = None
+    while True:
+        with engine.connect() as conn:
+            page = conn.execute(query if last is None else query.where(key > last)).all()
+        yield from page
+        if len(page) < FETCH_SIZE:
+            return
+        last = page[-1][key_index]
+
+
+def _plain(value):
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+def _chunked(lines: Iterator[str], size: int = FETCH_SIZE) -> Iterator[str]:
+    # Join lines into larger chunks so the response isn't one write per row
+    while True:
+        chunk = "".join(islice(lines, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def export_ndjson(engine, resource: str) -> Iterator[str]:
+    names = export_columns(resource)
+    lines = (
+        json.dumps({name: _plain(value) for name, value in zip(names, row)}) + "\n"
+        for row in iter_rows(engine, resource)
+    )
+    return _chunked(lines)
+
+
+def export_csv(engine, resource: str) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def lines():
+        writer.writerow(export_columns(resource))
+        for row in iter_rows(engine, resource):
+            writer.writerow([_plain(value) for value in row])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    return _chunked(lines())
+
+
+EXPORTERS = {"ndjson": export_ndjson, "csv": export_csv}
+
+
+# --- IMPORT ---
+def _converter(column) -> Callable:
+    """Coerce a raw NDJSON/CSV value into what the column stores."""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = None
+
+    if python_type is bool:
+        convert = lambda v: v if isinstance(v, bool) else str(v).lower() in ("1", "true", "yes")
+    elif python_type in (int, float) or (python_type and issubclass(python_type, enum.Enum)):
+        convert = python_type
+    else:
+        convert = lambda v: v
+
+    def coerce(value):
+        if value is None or (value == "" and column.nullable):
+            return None
+        return convert(value)
+    return coerce
+
+
+def read_ndjson(stream: Iterable[str]) -> Iterator[dict]:
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def read_csv(stream: Iterable[str]) -> Iterator[dict]:
+    yield from csv.DictReader(stream)
+
+
+READERS = {"ndjson": read_ndjson, "csv": read_csv}
+
+
+def import_rows(engine, resource: str, records: Iterable[dict], batch_size: int = 5000) -> int:
+    """Insert records in batches, one transaction and one executemany per batch.
+
+    Seller stats for imported items and orders are updated in the same
+    transaction as the rows themselves. Returns the number of rows inserted.
+    """
+    table = _table(resource)
+    converters: Dict[str, Callable] = {column.name: _converter(column) for column in table.columns}
+    # executemany takes its bind parameters from the first row, so every row
+    # carries every column: the column default (or None) where a key is missing
+    defaults = {
+        column.name: column.default.arg if column.default is not None and column.default.is_scalar else None
+        for column in table.columns
+    }
+    insert = table.insert()
+    records = iter(records)
+    total = 0
+    while True:
+        batch = [
+            {name: converters[name](record[name]) if name in record else default for name, default in defaults.items()}
+            for record in islice(records, batch_size)
+        ]
+        if not batch:
+            break
+        with Session(engine) as session:
+            session.execute(insert, batch)
+            if resource == "items":
+                record_items_imported(session, batch)
+                record_catalog_change(session, None)
+            elif resource == "orders":
+                record_orders_imported(session, batch)
+            elif resource == "users":
+                # Re-derive the signup id counter from the new high-water mark
+                reset_counter(session, "user")
+            session.commit()
+        total += len(batch)
+    return total
+
+
+if __name__ == "__main__":
+    import time
+    from backend.db import create_db_and_tables, get_engine
+
+    parser = argparse.ArgumentParser(description="101 Dress bulk export/import")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_cmd = commands.add_parser("export", help="stream a table to stdout")
+    export_cmd.add_argument("resource", choices=RESOURCES)
+    export_cmd.add_argument("--format", choices=FORMATS, default="ndjson")
+    import_cmd = commands.add_parser("import", help="load a file into a table")
+    import_cmd.add_argument("resource", choices=RESOURCES)
+    import_cmd.add_argument("path")
+    import_cmd.add_argument("--format", choices=FORMATS, help="defaults to the file extension")
+    import_cmd.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    create_db_and_tables()
+    if args.command == "export":
+        for chunk in EXPORTERS[args.format](get_engine(), args.resource):
+            sys.stdout.write(chunk)
+    else:
+        fmt = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+        started = time.perf_counter()
+        with open(args.path, newline="") as f:
+            count = import_rows(get_engine(), args.resource, READERS[fmt](f), batch_size=args.batch_size)
+        elapsed = time.perf_counter() - started
+        print(f"Imported {count} {args.resource} in {elapsed:.1f}s ({count / max(elapsed, 1e-9) * 60:,.0f} rows/min)",
+              file=sys.stderr)
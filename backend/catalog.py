@@ -0,0 +1,339 @@
+"""Memory-compact, read-only snapshot of the item catalog.
+
+Items are held column-wise: low-cardinality strings (brand, category, size,
+condition, type, status, seller, image) as small integer codes into interned
+tables, titles packed into one UTF-8 buffer, prices in typed double arrays.
+Each filterable value also keeps the ascending list of row positions holding
+it, so `/api/items` filtering and pagination only touch matching rows.
+
+The snapshot follows writes through the `catalogchange` log: every item write
+appends a row there in the same transaction, and `catch_up()` applies rows
+newer than the last one seen. Readers never lock: new items are appended in
+place (a reader only looks at the rows that existed when it started), and
+changes to existing items are made on a copy that is then swapped in.
+Benchmark against the ORM path with:
+
+    python -m backend.catalog --bench
+"""
+import json
+import math
+import threading
+from array import array
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional
+from sqlalchemy import delete, func, select
+from sqlmodel import Session
+from backend.models import CatalogChange, Counter, Item
+
+FILTERS = ("seller_id", "category", "brand", "size", "condition", "type")
+INTERNED = FILTERS + ("status", "image")
+PRICES = ("sale_price", "rent_price", "deposit")
+COLUMNS = ("id", "title", *INTERNED, *PRICES, "verified")
+
+
+def record_catalog_change(session: Session, item_id: Optional[int]):
+    """Log an item write for snapshots to pick up; call inside the write's transaction."""
+    session.add(CatalogChange(item_id=item_id))
+
+
+def prune_catalog_changes(session: Session):
+    """Delete change-log rows the previous prune had already seen.
+
+    Run periodically, this keeps each row for at least one interval, far longer
+    than a running snapshot takes to catch up. The newest row is always kept so
+    sqlite never hands out a low `seq` again; a snapshot that did fall behind
+    the pruned range rebuilds itself in `catch_up`.
+    """
+    newest = session.execute(select(func.max(CatalogChange.seq))).scalar() or 0
+    mark = session.get(Counter, "catalogchange_pruned")
+    if mark is None:
+        mark = Counter(name="catalogchange_pruned")
+    else:
+        session.execute(delete(CatalogChange).where(CatalogChange.seq <= mark.value, CatalogChange.seq < newest))
+    mark.value = newest
+    session.add(mark)
+
+
+class _Interned:
+    """Bidirectional value <-> code table for one column."""
+
+    def __init__(self):
+        self.values: List = []
+        self.codes: Dict = {}
+
+    def code(self, value) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class _Strings:
+    """Variable-length strings packed in one buffer, addressed by (start, length)."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.starts = array("Q")
+        self.lengths = array("I")
+
+    def _pack(self, value: str):
+        encoded = value.encode()
+        start = len(self.buffer)
+        self.buffer += encoded
+        return start, len(encoded)
+
+    def append(self, value: str):
+        start, length = self._pack(value)
+        self.starts.append(start)
+        self.lengths.append(length)
+
+    def set(self, index: int, value: str):
+        # The old bytes are left behind; a rebuild compacts the buffer
+        self.starts[index], self.lengths[index] = self._pack(value)
+
+    def copy(self) -> "_Strings":
+        # The buffer only ever grows, so a copy can share it
+        clone = _Strings.__new__(_Strings)
+        clone.buffer = self.buffer
+        clone.starts = array("Q", self.starts)
+        clone.lengths = array("I", self.lengths)
+        return clone
+
+    def get(self, index: int) -> str:
+        start = self.starts[index]
+        return self.buffer[start:start + self.lengths[index]].decode()
+
+
+class _Columns:
+    def __init__(self):
+        self.ids = array("q") # ascending, so positions are found by bisect
+        self.titles = _Strings()
+        self.tables = {name: _Interned() for name in INTERNED}
+        self.codes = {name: array("I") for name in INTERNED}
+        # Per filter column: value code -> ascending positions of rows with that value
+        self.postings: Dict[str, Dict[int, array]] = {name: {} for name in FILTERS}
+        self.prices = {name: array("d") for name in PRICES} # NaN stands for None
+        self.verified = array("b")
+
+    def append(self, row):
+        """Add a row at the end; safe while readers use this object."""
+        values = dict(zip(COLUMNS, row))
+        position = len(self.ids)
+        self.titles.append(values["title"])
+        for name in INTERNED:
+            code = self.tables[name].code(values[name])
+            self.codes[name].append(code)
+            if name in self.postings:
+                self.postings[name].setdefault(code, array("I")).append(position)
+        for name in PRICES:
+            self.prices[name].append(math.nan if values[name] is None else values[name])
+        self.verified.append(bool(values["verified"]))
+        # Last, so a reader that sees the new length sees the whole row
+        self.ids.append(values["id"])
+
+    def update(self, index: int, row):
+        """Rewrite a row in place; only for a copy no reader can see yet."""
+        values = dict(zip(COLUMNS, row))
+        self.titles.set(index, values["title"])
+        for name in INTERNED:
+            old, new = self.codes[name][index], self.tables[name].code(values[name])
+            self.codes[name][index] = new
+            if name in self.postings and old != new:
+                # Replaced rather than edited: the lists are shared with the original
+                positions = array("I", self.postings[name][old])
+                del positions[bisect_left(positions, index)]
+                self.postings[name][old] = positions
+                positions = array("I", self.postings[name].get(new, ()))
+                insort(positions, index)
+                self.postings[name][new] = positions
+        for name in PRICES:
+            self.prices[name][index] = math.nan if values[name] is None else values[name]
+        self.verified[index] = bool(values["verified"])
+
+    def copy(self) -> "_Columns":
+        """A copy that `update` may change while readers keep using this one.
+
+        Interned tables and posting lists are shared: tables only grow, and
+        `update` replaces posting lists instead of editing them.
+        """
+        clone = _Columns.__new__(_Columns)
+        clone.ids = array("q", self.ids)
+        clone.titles = self.titles.copy()
+        clone.tables = self.tables
+        clone.codes = {name: array("I", codes) for name, codes in self.codes.items()}
+        clone.postings = {name: dict(lists) for name, lists in self.postings.items()}
+        clone.prices = {name: array("d", prices) for name, prices in self.prices.items()}
+        clone.verified = array("b", self.verified)
+        return clone
+
+    def row(self, index: int) -> dict:
+        row = {"id": self.ids[index], "title": self.titles.get(index)}
+        for name in INTERNED:
+            row[name] = self.tables[name].values[self.codes[name][index]]
+        for name in PRICES:
+            price = self.prices[name][index]
+            row[name] = None if math.isnan(price) else price
+        row["verified"] = bool(self.verified[index])
+        return row
+
+
+class CatalogSnapshot:
+    def __init__(self, get_engine: Callable):
+        self.get_engine = get_engine
+        self._columns = _Columns()
+        self.last_seq = 0
+        self._refresh_lock = threading.RLock() # one rebuild/catch-up at a time; readers take no lock
+
+    def __len__(self):
+        return len(self._columns.ids)
+
+    def _rows(self, session: Session, item_ids: Optional[List[int]] = None) -> Iterator[tuple]:
+        query = select(*(getattr(Item, name) for name in COLUMNS)).order_by(Item.id)
+        if item_ids is not None:
+            query = query.where(Item.id.in_(item_ids))
+        yield from session.execute(query.execution_options(yield_per=1000))
+
+    def rebuild(self):
+        """Load every item into fresh columns, then swap them in."""
+        with self._refresh_lock, Session(self.get_engine()) as session:
+            # Read the log position first so changes made during the scan are replayed
+            last_seq = session.execute(select(func.max(CatalogChange.seq))).scalar() or 0
+            columns = _Columns()
+            for row in self._rows(session):
+                columns.append(row)
+            self._columns, self.last_seq = columns, last_seq
+
+    def catch_up(self):
+        """Apply change-log rows written since the last rebuild or catch-up."""
+        with self._refresh_lock, Session(self.get_engine()) as session:
+            oldest = session.execute(select(func.min(CatalogChange.seq))).scalar()
+            if oldest is not None and oldest > self.last_seq + 1:
+                # Rows we never applied were pruned
+                return self.rebuild()
+            changes = session.exec(
+                select(CatalogChange.seq, CatalogChange.item_id)
+                .where(CatalogChange.seq > self.last_seq)
+                .order_by(CatalogChange.seq)
+            ).all()
+            if not changes:
+                return
+            if any(item_id is None for _, item_id in changes):
+                return self.rebuild()
+            rows = list(self._rows(session, sorted({item_id for _, item_id in changes})))
+            columns = self._columns
+            ids = columns.ids
+            updated = [row for row in rows if ids and row[0] <= ids[-1]]
+            # New items always have the highest ids; anything else means a rebuild
+            if any(ids[bisect_left(ids, row[0])] != row[0] for row in updated):
+                return self.rebuild()
+            if updated:
+                columns = columns.copy()
+            for row in rows:
+                index = bisect_left(columns.ids, row[0])
+                if index < len(columns.ids):
+                    columns.update(index, row)
+                else:
+                    columns.append(row)
+            self._columns, self.last_seq = columns, changes[-1][0]
+
+    def query(self, limit: Optional[int] = None, offset: int = 0, **filters) -> List[dict]:
+        """Items matching every given filter, newest first, like the ORM endpoint.
+
+        Walks the shortest posting list among the filters and checks the rest
+        per row, so the cost follows the number of matches, not the catalog size.
+        """
+        columns = self._columns
+        count = len(columns.ids) # rows appended after this point are ignored
+        postings = []
+        for name, value in filters.items():
+            if not value: # empty means unfiltered, as in the ORM path
+                continue
+            code = columns.tables[name].codes.get(value)
+            positions = columns.postings[name].get(code) if code is not None else None
+            if positions is None:
+                return []
+            postings.append((bisect_left(positions, count), name, code, positions))
+
+        if not postings:
+            matches = range(count - 1 - offset, -1, -1)
+        else:
+            end, shortest, _, positions = min(postings, key=lambda posting: posting[0])
+            checks = [(columns.codes[name], code) for _, name, code, _ in postings if name != shortest]
+            if not checks:
+                matches = (positions[i] for i in range(end - 1 - offset, -1, -1))
+            else:
+                candidates = (positions[i] for i in range(end - 1, -1, -1))
+                matches = islice(
+                    (index for index in candidates if all(codes[index] == code for codes, code in checks)),
+                    offset, None,
+                )
+        return [columns.row(index) for index in islice(matches, limit)]
+
+    def query_json(self, **kwargs) -> bytes:
+        return json.dumps(self.query(**kwargs), separators=(",", ":")).encode()
+
+
+if __name__ == "__main__":
+    import argparse
+    import gc
+    import time
+    import tracemalloc
+    from collections import Counter
+    from sqlmodel import select as orm_select
+    from backend.db import get_read_engine
+
+    parser = argparse.ArgumentParser(description="Compare the catalog snapshot with the ORM path")
+    parser.add_argument("--bench", action="store_true", required=True)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    def measure(build):
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        started = time.perf_counter()
+        result = build()
+        elapsed = time.perf_counter() - started
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+        return result, size, elapsed
+
+    snapshot = CatalogSnapshot(get_read_engine)
+    _, snapshot_bytes, snapshot_build = measure(snapshot.rebuild)
+    session = Session(get_read_engine())
+    items, orm_bytes, orm_load = measure(lambda: session.exec(orm_select(Item).order_by(Item.id.desc())).all())
+    count = max(1, len(items))
+    print(f"{len(items)} items")
+    print(f"memory/item   snapshot {snapshot_bytes / count:8.0f} B   orm {orm_bytes / count:8.0f} B")
+    print(f"load          snapshot {snapshot_build * 1000:8.1f} ms  orm {orm_load * 1000:8.1f} ms")
+
+    first = items[0] if items else None
+    brands = Counter(item.brand for item in items)
+    cases = {
+        "page of 50": dict(limit=50),
+        "deep offset": dict(limit=50, offset=len(items) // 2),
+        "common brand": dict(brand=brands.most_common(1)[0][0] if brands else None, limit=50),
+        "rare brand": dict(brand=min(brands, key=brands.get) if brands else None, limit=50),
+        "brand + size": dict(brand=first.brand if first else None, size=first.size if first else None, limit=50),
+        "seller, all": dict(seller_id=first.seller_id if first else None),
+    }
+    for label, kwargs in cases.items():
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            snapshot.query_json(**kwargs)
+        snapshot_ms = (time.perf_counter() - started) * 1000 / args.repeat
+
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            with Session(get_read_engine()) as s:
+                query = orm_select(Item).order_by(Item.id.desc())
+                for name in FILTERS:
+                    if kwargs.get(name):
+                        query = query.where(getattr(Item, name) == kwargs[name])
+                query = query.offset(kwargs.get("offset", 0)).limit(kwargs.get("limit"))
+                json.dumps([row.model_dump(mode="json") for row in s.exec(query).all()])
+        orm_ms = (time.perf_counter() - started) * 1000 / args.repeat
+        print(f"{label:13} snapshot {snapshot_ms:8.2f} ms  orm {orm_ms:8.2f} ms")
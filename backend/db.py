@@ -0,0 +1,134 @@
+import itertools
+import os
+import sqlite3
+import threading
+from typing import Callable, List, Optional
+from sqlalchemy.engine import make_url
+from sqlmodel import Session, SQLModel, create_engine, delete, select, update
+from backend.models import Counter
+from backend.settings import Settings
+
+# Engines are created on first use in each process, never at import time, so
+# a `gunicorn --preload` master never opens connections its forked workers
+# would inherit. A pid change means we are in a forked child: the parent's
+# pools are abandoned (not closed, the parent still owns those sockets).
+_settings: Optional[Settings] = None
+_engines = None # (pid, primary, [read replicas])
+_replica_cursor = itertools.count()
+_lock = threading.Lock()
+
+def configure(settings: Settings):
+    """Switch to new settings; engines for the old URLs are disposed."""
+    global _settings, _engines
+    with _lock:
+        _settings = settings
+        if _engines is not None and _engines[0] == os.getpid():
+            for engine in [_engines[1], *_engines[2]]:
+                engine.dispose()
+        _engines = None
+
+def get_settings() -> Settings:
+    return _settings or Settings.from_env()
+
+def sqlite_path(url: Optional[str] = None) -> Optional[str]:
+    """Filesystem path of a sqlite URL (the primary by default), else None."""
+    parsed = make_url(url or get_settings().database_url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+        return None
+    return parsed.database
+
+def _create_engine(url: str, settings: Settings, read_only: bool = False):
+    kwargs = {"pool_size": settings.db_pool_size, "pool_timeout": settings.db_pool_timeout}
+    path = sqlite_path(url)
+    if make_url(url).get_backend_name() == "sqlite":
+        kwargs["connect_args"] = {"check_same_thread": False}
+        if path is None:
+            kwargs = {"connect_args": kwargs["connect_args"]} # in-memory databases don't pool
+        elif read_only:
+            url = f"sqlite:///file:{path}?mode=ro&uri=true"
+    else:
+        kwargs["pool_pre_ping"] = True
+    return create_engine(url, **kwargs)
+
+def _current_engines():
+    global _engines
+    engines = _engines
+    if engines is not None and engines[0] == os.getpid():
+        return engines
+    with _lock:
+        if _engines is None or _engines[0] != os.getpid():
+            if _engines is not None:
+                for engine in [_engines[1], *_engines[2]]:
+                    engine.dispose(close=False)
+            settings = get_settings()
+            primary = _create_engine(settings.database_url, settings)
+            replicas = [_create_engine(url, settings, read_only=True) for url in settings.read_replica_urls]
+            _engines = (os.getpid(), primary, replicas)
+        return _engines
+
+def get_engine():
+    """The primary, used for every write."""
+    return _current_engines()[1]
+
+def get_read_engine():
+    """A read replica (round-robin) if any are configured, else the primary.
+
+    A sqlite replica whose file hasn't been copied yet (first start, before the
+    refresh job has run) is skipped rather than failing the read.
+    """
+    replicas: List = [
+        engine for engine, url in zip(_current_engines()[2], get_settings().read_replica_urls)
+        if sqlite_path(url) is None or os.path.exists(sqlite_path(url))
+    ]
+    if not replicas:
+        return get_engine()
+    return replicas[next(_replica_cursor) % len(replicas)]
+
+def create_db_and_tables():
+    SQLModel.metadata.create_all(get_engine())
+
+def get_session():
+    with Session(get_engine()) as session:
+        yield session
+
+def get_read_session():
+    """Session for GET handlers; may lag the primary by one replica refresh."""
+    with Session(get_read_engine()) as session:
+        yield session
+
+def refresh_replicas():
+    """Copy the primary sqlite file over each sqlite replica with the online backup API.
+
+    The backup is consistent even while the primary is being written, and
+    replica readers keep working (they briefly wait on the copy's lock).
+    """
+    settings = get_settings()
+    source_path = sqlite_path(settings.database_url)
+    if source_path is None:
+        return
+    for url in settings.read_replica_urls:
+        target_path = sqlite_path(url)
+        if target_path is None:
+            continue
+        source = sqlite3.connect(source_path)
+        target = sqlite3.connect(target_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+
+def allocate_id(session: Session, name: str, initial: Callable[[Session], int]) -> int:
+    """Return the next value of a named counter, as part of the caller's transaction.
+
+    `initial` computes the current high-water mark the first time the counter is
+    used (or after it has been reset); every later call is a single-row UPDATE.
+    """
+    if session.get(Counter, name) is None:
+        session.add(Counter(name=name, value=initial(session)))
+        session.flush()
+    session.exec(update(Counter).where(Counter.name == name).values(value=Counter.value + 1))
+    return session.exec(select(Counter.value).where(Counter.name == name)).one()
+
+def reset_counter(session: Session, name: str):
+    session.exec(delete(Counter).where(Counter.name == name))
@@ -0,0 +1,248 @@
+import asyncio
+import json
+import os
+import random
+import socket
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+from sqlalchemy import func, or_, and_
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select, update
+from backend.models import Job, JobStatus
+
+# --- HANDLER REGISTRY ---
+# Handlers are plain sync functions `fn(session, payload)`; the worker commits
+# the session after a successful run and runs them off the event loop.
+HANDLERS: Dict[str, Callable[[Session, dict], None]] = {}
+
+def handler(kind: str):
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+class JobQueue:
+    """Persistent queue on the `job` table with leasing and visibility timeouts.
+
+    A leased job is invisible to other workers until `leased_until`; the worker
+    running it extends the lease while the handler runs, and if the worker dies
+    before acking, the job becomes leasable again once the lease runs out.
+    """
+
+    def __init__(self, get_engine: Callable, visibility_timeout: float = 60.0, backoff_base: float = 2.0, backoff_max: float = 300.0):
+        self.get_engine = get_engine # resolved per call so the queue survives a fork
+        self.visibility_timeout = visibility_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def enqueue(self, kind: str, payload: Optional[dict] = None, idempotency_key: Optional[str] = None,
+                delay: float = 0.0, max_attempts: int = 5) -> int:
+        """Add a job and return its id. A repeated idempotency key returns the original job."""
+        now = time.time()
+        with Session(self.get_engine()) as session:
+            if idempotency_key:
+                existing = session.exec(select(Job).where(Job.idempotency_key == idempotency_key)).first()
+                if existing:
+                    return existing.id
+            job = Job(
+                kind=kind,
+                payload=json.dumps(payload or {}),
+                idempotency_key=idempotency_key,
+                max_attempts=max_attempts,
+                run_at=now + delay,
+                created_at=now,
+            )
+            session.add(job)
+            try:
+                session.commit()
+            except IntegrityError:
+                # Lost a race with another enqueue using the same key
+                session.rollback()
+                return session.exec(select(Job).where(Job.idempotency_key == idempotency_key)).one().id
+            return job.id
+
+    def _leasable(self, now: float):
+        return or_(
+            and_(Job.status == JobStatus.QUEUED, Job.run_at <= now),
+            # A lapsed lease is retried only while attempts remain; the rest are
+            # marked failed by the `purge_jobs` housekeeping job
+            and_(Job.status == JobStatus.RUNNING, Job.leased_until < now, Job.attempts < Job.max_attempts),
+        )
+
+    def lease(self, worker_id: str) -> Optional[Job]:
+        """Claim the next due job, or return None if nothing is ready."""
+        now = time.time()
+        with Session(self.get_engine()) as session:
+            for _ in range(3):
+                candidate = session.exec(
+                    select(Job.id).where(self._leasable(now)).order_by(Job.run_at).limit(1)
+                ).first()
+                if candidate is None:
+                    return None
+                # Conditional UPDATE so two workers can never claim the same row
+                result = session.exec(
+                    update(Job)
+                    .where(Job.id == candidate, self._leasable(now))
+                    .values(
+                        status=JobStatus.RUNNING,
+                        attempts=Job.attempts + 1,
+                        leased_until=now + self.visibility_timeout,
+                        leased_by=worker_id,
+                        started_at=func.coalesce(Job.started_at, now),
+                    )
+                )
+                session.commit()
+                if result.rowcount == 1:
+                    job = session.get(Job, candidate)
+                    session.expunge(job)
+                    return job
+        return None
+
+    def _update_leased(self, job: Job, **values) -> bool:
+        # Only applies while `job` is still leased to us; False means the lease
+        # lapsed and the job was handed to another worker
+        with Session(self.get_engine()) as session:
+            result = session.exec(
+                update(Job)
+                .where(Job.id == job.id, Job.status == JobStatus.RUNNING, Job.leased_by == job.leased_by)
+                .values(**values)
+            )
+            session.commit()
+            return result.rowcount == 1
+
+    def extend(self, job: Job) -> bool:
+        """Push the lease of a running job out by another visibility timeout."""
+        return self._update_leased(job, leased_until=time.time() + self.visibility_timeout)
+
+    def complete(self, job: Job) -> bool:
+        return self._update_leased(job, status=JobStatus.DONE, finished_at=time.time(), leased_until=None, last_error=None)
+
+    def fail(self, job: Job, error: str) -> bool:
+        """Requeue with exponential backoff, or mark failed once attempts run out."""
+        now = time.time()
+        if job.attempts >= job.max_attempts:
+            values = dict(status=JobStatus.FAILED, finished_at=now)
+        else:
+            delay = min(self.backoff_max, self.backoff_base * 2 ** (job.attempts - 1))
+            values = dict(status=JobStatus.QUEUED, run_at=now + delay * random.uniform(0.5, 1.0))
+        return self._update_leased(job, leased_until=None, last_error=error[:2000], **values)
+
+    def depth(self) -> Dict[str, int]:
+        with Session(self.get_engine()) as session:
+            rows = session.exec(select(Job.status, func.count()).group_by(Job.status)).all()
+        counts = {status.value: 0 for status in JobStatus}
+        counts.update({JobStatus(status).value: count for status, count in rows})
+        return counts
+
+
+class WorkerPool:
+    """A fixed number of asyncio workers draining a JobQueue.
+
+    Handlers run in the default thread pool so a slow job never blocks the
+    event loop serving requests.
+    """
+
+    def __init__(self, queue: JobQueue, concurrency: int = 2, poll_interval: float = 0.5):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._tasks = []
+        self._stopping = asyncio.Event()
+        # Rolling window of (queue wait, run time) in seconds for finished jobs
+        self._latencies = deque(maxlen=1000)
+        self.processed = 0
+        self.failed = 0
+        self.lost = 0 # finished after their lease had already passed to another worker
+
+    def start(self):
+        self._stopping.clear()
+        # Worker ids are taken at start time so they are correct after a fork
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks = [asyncio.create_task(self._run(f"{prefix}:{i}")) for i in range(self.concurrency)]
+
+    async def stop(self):
+        self._stopping.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self, worker_id: str):
+        while not self._stopping.is_set():
+            try:
+                job = await asyncio.to_thread(self.queue.lease, worker_id)
+                if job is not None:
+                    await self.run_job(job)
+                    continue
+            except Exception as exc:
+                # Usually "database is locked" while an import or handler holds the
+                # write lock. An unacked job is leased again once its lease lapses.
+                print(f"Worker {worker_id} hit a queue error, retrying: {exc!r}")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_job(self, job: Job):
+        started = time.time()
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            await asyncio.to_thread(self._execute, job)
+        except Exception as exc:
+            print(f"Job {job.id} ({job.kind}) failed on attempt {job.attempts}: {exc!r}")
+            acked = await asyncio.to_thread(self.queue.fail, job, repr(exc))
+            self._count(job, acked, failed=True)
+            return
+        finally:
+            heartbeat.cancel()
+        acked = await asyncio.to_thread(self.queue.complete, job)
+        self._count(job, acked)
+        if acked:
+            self._latencies.append((started - job.run_at, time.time() - started))
+
+    def _count(self, job: Job, acked: bool, failed: bool = False):
+        if not acked:
+            self.lost += 1
+            print(f"Job {job.id} ({job.kind}) lost its lease before finishing; its result was not recorded")
+        elif failed:
+            self.failed += 1
+        else:
+            self.processed += 1
+
+    async def _heartbeat(self, job: Job):
+        """Keep extending the lease so a long handler isn't leased out twice."""
+        while True:
+            await asyncio.sleep(self.queue.visibility_timeout / 3)
+            try:
+                if not await asyncio.to_thread(self.queue.extend, job):
+                    return
+            except Exception as exc:
+                # e.g. the handler itself holds the sqlite write lock; try again next beat
+                print(f"Job {job.id} ({job.kind}) lease extension failed: {exc!r}")
+
+    def _execute(self, job: Job):
+        fn = HANDLERS.get(job.kind)
+        if fn is None:
+            raise LookupError(f"No handler registered for job kind '{job.kind}'")
+        with Session(self.queue.get_engine()) as session:
+            fn(session, json.loads(job.payload))
+            session.commit()
+
+    def metrics(self) -> dict:
+        def percentile(values, pct):
+            if not values:
+                return None
+            ordered = sorted(values)
+            return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+        waits = [wait for wait, _ in self._latencies]
+        runs = [run for _, run in self._latencies]
+        return {
+            "depth": self.queue.depth(),
+            "workers": len(self._tasks),
+            "processed": self.processed,
+            "failed": self.failed,
+            "lost": self.lost,
+            "wait_seconds": {"p50": percentile(waits, 0.5), "p95": percentile(waits, 0.95)},
+            "run_seconds": {"p50": percentile(runs, 0.5), "p95": percentile(runs, 0.95)},
+        }
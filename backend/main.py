@@ -1,15 +1,25 @@
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 from datetime import datetime, timedelta
+from functools import lru_cache, partial
 from typing import List, Optional
+import asyncio
+import csv
+import io
 import shutil
 import os
 from pathlib import Path
-from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, FastAPI, Depends, HTTPException, Query, Request, status, UploadFile, File
+from fastapi.responses import Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlmodel import Session, SQLModel, create_engine, select
+from sqlalchemy import Integer, cast, func
+from sqlalchemy.exc import StatementError
+from sqlmodel import Session, SQLModel, select
 from backend.models import (
     User,
     Item,
@@ -19,7 +29,25 @@ from backend.models import (
     Token,
     UserRead,
     OrderStatus,
+    SellerDashboard,
+)
+from backend import db
+from backend.catalog import CatalogSnapshot, record_catalog_change
+from backend.bulk import EXPORTERS, FORMATS, READERS, RESOURCES, import_rows
+from backend.db import (
+    allocate_id,
+    create_db_and_tables,
+    get_engine,
+    get_read_engine,
+    get_read_session,
+    get_session,
 )
+from backend.jobs import WorkerPool
+from backend.ratelimit import Limit, RateLimitMiddleware, RouteRule
+from backend.settings import Settings
+from backend.singleflight import SingleFlight
+from backend.stats import ensure_seller_stats, get_dashboard, record_item_created, record_order_created
+from backend.tasks import job_queue # importing tasks also registers the job handlers
 
 # --- RESPONSE MODELS ---
 class OrderWithItem(SQLModel):
@@ -34,27 +62,19 @@ SECRET_KEY = "your-secret-key-for-dev-only"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 600 # Long for dev
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
-# --- DATABASE CONFIG ---
-sqlite_file_name = "database_v2.db" # Using v2 to avoid schema conflicts
-sqlite_url = f"sqlite:///backend/{sqlite_file_name}"
-engine = create_engine(sqlite_url, connect_args={"check_same_thread": False})
-
-def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
-
-def get_session():
-    with Session(engine) as session:
-        yield session
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    # Built on first use rather than at import, keeping cold start cheap
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # --- AUTH HELPERS ---
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -62,6 +82,13 @@ def create_access_token(data: dict):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+def token_subject(token: str) -> Optional[str]:
+    """Email a valid access token was issued to, else None. No database lookup."""
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+    except JWTError:
+        return None
+
 async def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -80,314 +107,272 @@ async def get_current_user(token: str = Depends(oauth2_scheme), session: Session
         raise credentials_exception
     return user
 
-# --- APP SETUP ---
-app = FastAPI(title="101 Dress API")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# --- STATIC FILES ---
-# Ensure upload directory exists
-UPLOAD_DIR = Path("frontend/public/assets/uploads")
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-
-# Mount the static directory so uploaded files are accessible via URL
-# Note: In production, you'd serve this via Nginx or S3, but for dev this works if frontend/public is served correctly
-# Since Vite serves public folder at root /, we might not need this if we save directly there?
-# But uploading via backend saves to disk. We need to tell backend where to save.
-# Let's save to frontend/public so Vite sees it.
+router = APIRouter()
 
+def _save_upload(source, location: Path):
+    with open(location, "wb+") as file_object:
+        shutil.copyfileobj(source, file_object)
 
-
-@app.post("/api/upload")
-async def upload_file(file: UploadFile = File(...)):
-    file_location = UPLOAD_DIR / file.filename
-    with open(file_location, "wb+") as file_object:
-        shutil.copyfileobj(file.file, file_object)
+@router.post("/api/upload")
+async def upload_file(request: Request, file: UploadFile = File(...)):
+    file_location = request.app.state.settings.upload_dir / file.filename
+    # Written in a worker thread so a large upload doesn't stall the event loop
+    await asyncio.to_thread(_save_upload, file.file, file_location)
     
     # Return absolute URL path relative to public folder for frontend consumption
     return {"url": f"/assets/uploads/{file.filename}"}
 
+def seed_database(session: Session):
+    """Create the demo users, listings and order on an empty database."""
+    if session.exec(select(User)).first():
+        return
+    hashed_pw = get_password_hash("password123")
+    mock_user = User(
+        id="u1",
+        email="alex@example.com",
+        hashed_password=hashed_pw,
+        name="Adhitya Chandel",
+        trust_score=92,
+        wallet_balance=45000,
+        escrow_balance=12500,
+        avatar="https://i.pravatar.cc/150?u=u1"
+    )
+    session.add(mock_user)
+    
+    # Seed another user for order logic
+    seller_user = User(
+        id="u2",
+        email="sarah@example.com",
+        hashed_password=hashed_pw,
+        name="Sarah Jenkins",
+        trust_score=98,
+        wallet_balance=12000,
+        escrow_balance=500,
+        avatar="https://i.pravatar.cc/150?u=u2"
+    )
+    session.add(seller_user)
+    
+    items = [
+        Item(
+            title="Acne Studios Leather Jacket", 
+            category="Jackets", 
+            brand="Acne Studios", 
+            size="M", 
+            condition="A", 
+            type="both", 
+            sale_price=28500, 
+            rent_price=1500, 
+            deposit=8000, 
+            image="/assets/items/acne-jacket.png", 
+            seller_id="u1", 
+            verified=True
+        ),
+        Item(
+            title="Zimmermann Silk Dress", 
+            category="Dresses", 
+            brand="Zimmermann", 
+            size="S", 
+            condition="A", 
+            type="rent", 
+            rent_price=3200, 
+            deposit=10000, 
+            image="/assets/ysl_sunset.png", 
+            seller_id="u1", 
+            verified=True
+        ),
+        Item(
+            title="Balenciaga Track Sneakers",
+            category="Sneakers",
+            brand="Balenciaga",
+            size="42",
+            condition="A",
+            type="sale",
+            sale_price=55000,
+            image="/assets/balenciaga_sneakers.png",
+            seller_id="u1",
+            verified=True
+        ),
+        Item(
+            title="Prada Cleo Shoulder Bag",
+            category="Bags",
+            brand="Prada",
+            size="OS",
+            condition="S",
+            type="both",
+            sale_price=145000,
+            rent_price=5500,
+            deposit=25000,
+            image="/assets/prada_cleo.png",
+            seller_id="u1",
+            verified=True
+        ),
+        Item(
+            title="Jacquemus Le Chiquito",
+            category="Bags",
+            brand="Jacquemus",
+            size="Mini",
+            condition="B",
+            type="sale",
+            sale_price=38000,
+            image="https://images.unsplash.com/photo-1594223274512-ad4803739b7c?q=80&w=1000",
+            seller_id="u1",
+            verified=True
+        ),
+        Item(
+            title="Gucci GG Marmont Belt",
+            category="Accessories",
+            brand="Gucci",
+            size="90",
+            condition="A",
+            type="sale",
+            sale_price=22000,
+            image="/assets/gucci_belt.png",
+            seller_id="u1",
+            verified=True
+        ),
+        Item(
+            title="Saint Laurent Sunset Bag",
+            category="Bags",
+            brand="Saint Laurent",
+            size="Medium",
+            condition="A",
+            type="rent",
+            rent_price=4500,
+            deposit=15000,
+            image="/assets/ysl_sunset.png",
+            seller_id="u1",
+            verified=True
+        ),
+        Item(
+            title="Off-White Graphic Tee",
+            category="Tops",
+            brand="Off-White",
+            size="L",
+            condition="S",
+            type="sale",
+            sale_price=18500,
+            image="https://images.unsplash.com/photo-1521572163474-6864f9cf17ab?q=80&w=1000",
+            seller_id="u1",
+            verified=True
+        ),
+        Item(
+            title="Burberry Trench Coat",
+            category="Jackets",
+            brand="Burberry",
+            size="48",
+            condition="A",
+            type="both",
+            sale_price=85000,
+            rent_price=6000,
+            deposit=20000,
+            image="https://images.unsplash.com/photo-1591047139829-d91aecb6caea?q=80&w=1000",
+            seller_id="u1",
+            verified=True
+        ),
+        Item(
+            title="Dior Book Tote",
+            category="Bags",
+            brand="Dior",
+            size="Large",
+            condition="A",
+            type="both",
+            sale_price=210000,
+            rent_price=8000,
+            deposit=40000,
+            image="https://images.unsplash.com/photo-1544816153-12ad5d7132a1?q=80&w=1000",
+            seller_id="u1",
+            verified=True
+        ),
+        Item(
+            title="Celine Triomphe Sunglasses",
+            category="Accessories",
+            brand="Celine",
+            size="OS",
+            condition="S",
+            type="sale",
+            sale_price=32000,
+            image="https://images.unsplash.com/photo-1511499767350-a1590fdb7351?q=80&w=1000",
+            seller_id="u1",
+            verified=True
+        ),
+        Item(
+            title="Hermes Oran Sandals",
+            category="Shoes",
+            brand="Hermes",
+            size="38",
+            condition="A",
+            type="sale",
+            sale_price=48000,
+            image="https://images.unsplash.com/photo-1543163521-1bf539c55dd2?q=80&w=1000",
+            seller_id="u1",
+            verified=True
+        ),
+        # Item for u2 to sell and u1 to buy
+        Item(
+            title="Chanel Classic Flap",
+            category="Bags",
+            brand="Chanel",
+            size="Medium",
+            condition="A",
+            type="sale",
+            sale_price=450000,
+            image="https://images.unsplash.com/photo-1548036328-c9fa89d128fa?q=80&w=1000",
+            seller_id="u2",
+            verified=True
+        )
+    ]
+    
+    # Need to add items first to get IDs? No, usually IDs are auto-generated.
+    # But the objects are not flushed.
+    # We can create order after session.commit() or flush.
+    for item in items:
+        session.add(item)
+        record_item_created(session, item)
+    session.flush() # Populate IDs
+    
+    # Seed an Order: u1 buys u2's item (last item)
+    chanel_bag = items[-1]
+    mock_order = Order(
+        item_id=chanel_bag.id,
+        buyer_id="u1",
+        seller_id="u2",
+        type="buy",
+        status=OrderStatus.SHIPPED,
+        escrow_amount=chanel_bag.sale_price,
+        days_remaining=0
+    )
+    session.add(mock_order)
+    record_order_created(session, mock_order)
+    # Snapshots built before this commit rebuild on their next catch-up
+    record_catalog_change(session, None)
+    
+    session.commit()
 
-def fix_existing_images():
-    """Migrate remote images to local assets for performance"""
-    with Session(engine) as session:
-        items = session.exec(select(Item)).all()
-        updates = {
-            "Acne": "/assets/items/acne-jacket.png",
-            "Balenciaga": "/assets/balenciaga_sneakers.png",
-            "Zimmermann": "/assets/ysl_sunset.png", # Fallback
-            "Gucci": "/assets/gucci_belt.png",
-            "Prada": "/assets/prada_cleo.png",
-            "YSL": "/assets/ysl_sunset.png",
-            "Chanel": "/assets/chanel_classic_flap.png"
-        }
-        for item in items:
-            changed = False
-            # Check for keyword matches
-            for key, path in updates.items():
-                if key.lower() in item.title.lower() and item.image != path:
-                    item.image = path
-                    changed = True
-                    break
-            
-            # General fallback for any remaining unsplash links
-            if not changed and "http" in item.image:
-                item.image = "/assets/prada_cleo.png"
-                changed = True
-            
-            if changed:
-                session.add(item)
-        session.commit()
-
-@app.on_event("startup")
-def on_startup():
-    create_db_and_tables()
-    fix_existing_images()
-    with Session(engine) as session:
-        if not session.exec(select(User)).first():
-            hashed_pw = get_password_hash("password123")
-            mock_user = User(
-                id="u1",
-                email="alex@example.com",
-                hashed_password=hashed_pw,
-                name="Adhitya Chandel",
-                trust_score=92,
-                wallet_balance=45000,
-                escrow_balance=12500,
-                avatar="https://i.pravatar.cc/150?u=u1"
-            )
-            session.add(mock_user)
-            
-            # Seed another user for order logic
-            seller_user = User(
-                id="u2",
-                email="sarah@example.com",
-                hashed_password=hashed_pw,
-                name="Sarah Jenkins",
-                trust_score=98,
-                wallet_balance=12000,
-                escrow_balance=500,
-                avatar="https://i.pravatar.cc/150?u=u2"
-            )
-            session.add(seller_user)
-            
-            items = [
-                Item(
-                    title="Acne Studios Leather Jacket", 
-                    category="Jackets", 
-                    brand="Acne Studios", 
-                    size="M", 
-                    condition="A", 
-                    type="both", 
-                    sale_price=28500, 
-                    rent_price=1500, 
-                    deposit=8000, 
-                    image="/assets/items/acne-jacket.png", 
-                    seller_id="u1", 
-                    verified=True
-                ),
-                Item(
-                    title="Zimmermann Silk Dress", 
-                    category="Dresses", 
-                    brand="Zimmermann", 
-                    size="S", 
-                    condition="A", 
-                    type="rent", 
-                    rent_price=3200, 
-                    deposit=10000, 
-                    image="/assets/ysl_sunset.png", 
-                    seller_id="u1", 
-                    verified=True
-                ),
-                Item(
-                    title="Balenciaga Track Sneakers",
-                    category="Sneakers",
-                    brand="Balenciaga",
-                    size="42",
-                    condition="A",
-                    type="sale",
-                    sale_price=55000,
-                    image="/assets/balenciaga_sneakers.png",
-                    seller_id="u1",
-                    verified=True
-                ),
-                Item(
-                    title="Prada Cleo Shoulder Bag",
-                    category="Bags",
-                    brand="Prada",
-                    size="OS",
-                    condition="S",
-                    type="both",
-                    sale_price=145000,
-                    rent_price=5500,
-                    deposit=25000,
-                    image="/assets/prada_cleo.png",
-                    seller_id="u1",
-                    verified=True
-                ),
-                Item(
-                    title="Jacquemus Le Chiquito",
-                    category="Bags",
-                    brand="Jacquemus",
-                    size="Mini",
-                    condition="B",
-                    type="sale",
-                    sale_price=38000,
-                    image="https://images.unsplash.com/photo-1594223274512-ad4803739b7c?q=80&w=1000",
-                    seller_id="u1",
-                    verified=True
-                ),
-                Item(
-                    title="Gucci GG Marmont Belt",
-                    category="Accessories",
-                    brand="Gucci",
-                    size="90",
-                    condition="A",
-                    type="sale",
-                    sale_price=22000,
-                    image="/assets/gucci_belt.png",
-                    seller_id="u1",
-                    verified=True
-                ),
-                Item(
-                    title="Saint Laurent Sunset Bag",
-                    category="Bags",
-                    brand="Saint Laurent",
-                    size="Medium",
-                    condition="A",
-                    type="rent",
-                    rent_price=4500,
-                    deposit=15000,
-                    image="/assets/ysl_sunset.png",
-                    seller_id="u1",
-                    verified=True
-                ),
-                Item(
-                    title="Off-White Graphic Tee",
-                    category="Tops",
-                    brand="Off-White",
-                    size="L",
-                    condition="S",
-                    type="sale",
-                    sale_price=18500,
-                    image="https://images.unsplash.com/photo-1521572163474-6864f9cf17ab?q=80&w=1000",
-                    seller_id="u1",
-                    verified=True
-                ),
-                Item(
-                    title="Burberry Trench Coat",
-                    category="Jackets",
-                    brand="Burberry",
-                    size="48",
-                    condition="A",
-                    type="both",
-                    sale_price=85000,
-                    rent_price=6000,
-                    deposit=20000,
-                    image="https://images.unsplash.com/photo-1591047139829-d91aecb6caea?q=80&w=1000",
-                    seller_id="u1",
-                    verified=True
-                ),
-                Item(
-                    title="Dior Book Tote",
-                    category="Bags",
-                    brand="Dior",
-                    size="Large",
-                    condition="A",
-                    type="both",
-                    sale_price=210000,
-                    rent_price=8000,
-                    deposit=40000,
-                    image="https://images.unsplash.com/photo-1544816153-12ad5d7132a1?q=80&w=1000",
-                    seller_id="u1",
-                    verified=True
-                ),
-                Item(
-                    title="Celine Triomphe Sunglasses",
-                    category="Accessories",
-                    brand="Celine",
-                    size="OS",
-                    condition="S",
-                    type="sale",
-                    sale_price=32000,
-                    image="https://images.unsplash.com/photo-1511499767350-a1590fdb7351?q=80&w=1000",
-                    seller_id="u1",
-                    verified=True
-                ),
-                Item(
-                    title="Hermes Oran Sandals",
-                    category="Shoes",
-                    brand="Hermes",
-                    size="38",
-                    condition="A",
-                    type="sale",
-                    sale_price=48000,
-                    image="https://images.unsplash.com/photo-1543163521-1bf539c55dd2?q=80&w=1000",
-                    seller_id="u1",
-                    verified=True
-                ),
-                # Item for u2 to sell and u1 to buy
-                Item(
-                    title="Chanel Classic Flap",
-                    category="Bags",
-                    brand="Chanel",
-                    size="Medium",
-                    condition="A",
-                    type="sale",
-                    sale_price=450000,
-                    image="https://images.unsplash.com/photo-1548036328-c9fa89d128fa?q=80&w=1000",
-                    seller_id="u2",
-                    verified=True
-                )
-            ]
-            
-            # Need to add items first to get IDs? No, usually IDs are auto-generated.
-            # But the objects are not flushed.
-            # We can create order after session.commit() or flush.
-            for item in items:
-                session.add(item)
-            session.flush() # Populate IDs
-            
-            # Seed an Order: u1 buys u2's item (last item)
-            chanel_bag = items[-1]
-            mock_order = Order(
-                item_id=chanel_bag.id,
-                buyer_id="u1",
-                seller_id="u2",
-                type="buy",
-                status=OrderStatus.SHIPPED,
-                escrow_amount=chanel_bag.sale_price,
-                days_remaining=0
-            )
-            session.add(mock_order)
-            
-            session.commit()
+def max_user_number(session: Session) -> int:
+    """Highest N among `uN` user ids; seeds the user id counter once."""
+    number = cast(func.substr(User.id, 2), Integer)
+    return session.exec(select(func.max(number)).where(User.id.like("u%"))).one() or 0
 
 # --- ENDPOINTS ---
 
-@app.get("/")
+@router.get("/")
 def read_root():
     return {"message": "Welcome to 101 Dress API. Visit /docs for API documentation."}
 
-@app.post("/api/auth/signup", response_model=UserRead)
+@router.post("/api/auth/signup", response_model=UserRead)
 def signup(user_data: UserCreate, session: Session = Depends(get_session)):
     existing_user = session.exec(select(User).where(User.email == user_data.email)).first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    # Generate unique ID for demo
-    user_id = f"u{len(session.exec(select(User)).all()) + 1}"
+    hashed_password = get_password_hash(user_data.password)
+    # Allocating the id starts the write transaction, so do it after the slow hash
+    user_id = f"u{allocate_id(session, 'user', max_user_number)}"
     
     new_user = User(
         id=user_id,
         email=user_data.email,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=hashed_password,
         name=user_data.name,
     )
     session.add(new_user)
@@ -395,7 +380,7 @@ def signup(user_data: UserCreate, session: Session = Depends(get_session)):
     session.refresh(new_user)
     return new_user
 
-@app.post("/api/auth/login", response_model=Token)
+@router.post("/api/auth/login", response_model=Token)
 def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Session = Depends(get_session)):
     user = session.exec(select(User).where(User.email == form_data.username)).first()
     if not user or not verify_password(form_data.password, user.hashed_password):
@@ -404,41 +389,128 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Session = D
     access_token = create_access_token(data={"sub": user.email})
     return {"access_token": access_token, "token_type": "bearer"}
 
-@app.get("/api/items", response_model=List[Item])
-def read_items(seller_id: Optional[str] = None, session: Session = Depends(get_session)):
+@router.get("/api/items", response_model=List[Item])
+def read_items(
+    request: Request,
+    seller_id: Optional[str] = None,
+    category: Optional[str] = None,
+    brand: Optional[str] = None,
+    size: Optional[str] = None,
+    condition: Optional[str] = None,
+    type: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+    session: Session = Depends(get_read_session),
+):
+    filters = dict(seller_id=seller_id, category=category, brand=brand, size=size, condition=condition, type=type)
+    catalog = request.app.state.catalog
+    if catalog is not None:
+        body = catalog.query_json(limit=limit, offset=offset, **filters)
+        return Response(content=body, media_type="application/json")
+
     query = select(Item).order_by(Item.id.desc())
-    if seller_id:
-        query = query.where(Item.seller_id == seller_id)
-    return session.exec(query).all()
-
-@app.get("/api/items/{item_id}", response_model=Item)
-def read_item(item_id: int, session: Session = Depends(get_session)):
-    item = session.get(Item, item_id)
-    if not item:
+    for name, value in filters.items():
+        if value:
+            query = query.where(getattr(Item, name) == value)
+    return session.exec(query.offset(offset).limit(limit)).all()
+
+def load_item_json(item_id: int) -> Optional[bytes]:
+    with Session(get_read_engine()) as session:
+        item = session.get(Item, item_id)
+        return item.model_dump_json().encode() if item else None
+
+@router.get("/api/items/{item_id}", response_model=Item)
+async def read_item(item_id: int, request: Request):
+    # Concurrent reads of one item share a single lookup and serialized body
+    body = await request.app.state.item_reads.get(item_id, partial(load_item_json, item_id))
+    if body is None:
         raise HTTPException(status_code=404, detail="Item not found")
-    return item
+    return Response(content=body, media_type="application/json")
 
-@app.post("/api/items", response_model=Item)
-def create_item(item: Item, current_user: User = Depends(get_current_user), session: Session = Depends(get_session)):
+@router.post("/api/items", response_model=Item)
+def create_item(request: Request, item: Item, current_user: User = Depends(get_current_user), session: Session = Depends(get_session)):
     item.seller_id = current_user.id
     session.add(item)
+    record_item_created(session, item)
+    session.flush() # Populate item.id for the change log
+    record_catalog_change(session, item.id)
     session.commit()
     session.refresh(item)
+    if request.app.state.catalog is not None:
+        # So the seller sees the new listing straight away
+        request.app.state.catalog.catch_up()
     return item
 
-@app.get("/api/users/me", response_model=UserRead)
+@router.get("/api/users/me", response_model=UserRead)
 def read_user_me(current_user: User = Depends(get_current_user)):
     return current_user
 
-@app.get("/api/users/{user_id}", response_model=UserRead)
-def read_user(user_id: str, session: Session = Depends(get_session)):
-    user = session.get(User, user_id)
-    if not user:
+def load_user_json(user_id: str) -> Optional[bytes]:
+    with Session(get_read_engine()) as session:
+        user = session.get(User, user_id)
+        return UserRead.model_validate(user).model_dump_json().encode() if user else None
+
+@router.get("/api/users/{user_id}", response_model=UserRead)
+async def read_user(user_id: str, request: Request):
+    body = await request.app.state.user_reads.get(user_id, partial(load_user_json, user_id))
+    if body is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    return Response(content=body, media_type="application/json")
+
+@router.get("/api/users/{user_id}/dashboard", response_model=SellerDashboard)
+def read_user_dashboard(user_id: str, session: Session = Depends(get_read_session)):
+    if not session.get(User, user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    return get_dashboard(session, user_id)
+
+@router.get("/api/reads/metrics")
+def read_coalescing_metrics(request: Request):
+    return {"items": request.app.state.item_reads.metrics(), "users": request.app.state.user_reads.metrics()}
+
+@router.get("/api/jobs/metrics")
+def read_job_metrics(request: Request):
+    return request.app.state.worker_pool.metrics()
+
+def get_bulk_admin(request: Request, current_user: User = Depends(get_current_user)):
+    """Bulk export/import exposes every user's data; only BULK_ADMIN_EMAILS may use it."""
+    if current_user.email not in request.app.state.settings.bulk_admin_emails:
+        raise HTTPException(status_code=403, detail="Bulk export/import is restricted to administrators")
+    return current_user
+
+@router.get("/api/export/{resource}")
+def export_resource(resource: str, fmt: str = Query("ndjson", alias="format"), current_user: User = Depends(get_bulk_admin)):
+    if resource not in RESOURCES:
+        raise HTTPException(status_code=404, detail="Unknown resource")
+    if fmt not in EXPORTERS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format, use one of: {', '.join(FORMATS)}")
+    return StreamingResponse(
+        EXPORTERS[fmt](get_read_engine(), resource),
+        media_type=FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{resource}.{fmt}"'},
+    )
 
-@app.get("/api/orders", response_model=List[OrderWithItem])
-def read_orders(user_id: Optional[str] = None, session: Session = Depends(get_session)):
+@router.post("/api/import/{resource}")
+def import_resource(
+    resource: str,
+    file: UploadFile = File(...),
+    fmt: str = Query("ndjson", alias="format"),
+    batch_size: int = Query(5000, ge=1, le=50000),
+    current_user: User = Depends(get_bulk_admin),
+):
+    if resource not in RESOURCES:
+        raise HTTPException(status_code=404, detail="Unknown resource")
+    if fmt not in READERS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format, use one of: {', '.join(FORMATS)}")
+    try:
+        stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+        count = import_rows(get_engine(), resource, READERS[fmt](stream), batch_size=batch_size)
+    except (StatementError, csv.Error, KeyError, ValueError) as exc:
+        # Batches before the failing one are already committed
+        raise HTTPException(status_code=400, detail=f"Import failed: {exc.__class__.__name__}: {exc}"[:500])
+    return {"imported": count}
+
+@router.get("/api/orders", response_model=List[OrderWithItem])
+def read_orders(user_id: Optional[str] = None, session: Session = Depends(get_read_session)):
     query = select(Order)
     if user_id:
         query = query.where(Order.buyer_id == user_id)
@@ -446,16 +518,152 @@ def read_orders(user_id: Optional[str] = None, session: Session = Depends(get_se
     # Explicitly ensure items are loaded if lazy (SQLModel usually handles this dynamically in memory if session is active)
     return orders
 
+# --- APP FACTORY ---
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+
+def _mtime(path: Optional[Path]) -> Optional[float]:
+    try:
+        return path.stat().st_mtime if path else None
+    except OSError:
+        return None
+
+def schedule_replica_refresh(settings: Settings):
+    """Enqueue one replica refresh for the current interval, shared by every process."""
+    interval = settings.replica_refresh_seconds if settings.replica_refresh_seconds > 0 else 60.0
+    slot = int(time.time() // interval)
+    job_queue.enqueue("refresh_replicas", idempotency_key=f"refresh_replicas:{slot}", max_attempts=1)
+    return slot
+
+async def run_maintenance(app: FastAPI):
+    """Per-process housekeeping: hot-reload the config file, keep the catalog
+    snapshot current and schedule replica refreshes and job-table purges.
+
+    Scheduled jobs go through the job queue with one idempotency key per
+    interval, so only one runs per interval however many processes there are.
+    """
+    config_mtime = _mtime(app.state.settings.config_file)
+    last_slot = None
+    last_purge_hour = None
+    while True:
+        try:
+            settings = app.state.settings
+            mtime = _mtime(settings.config_file)
+            if mtime != config_mtime:
+                config_mtime = mtime
+                settings = Settings.from_env()
+                db.configure(settings)
+                app.state.settings = settings
+                print(f"Reloaded settings from {settings.config_file}")
+            if app.state.catalog is not None:
+                await asyncio.to_thread(app.state.catalog.catch_up)
+            if settings.read_replica_urls and settings.replica_refresh_seconds > 0:
+                slot = int(time.time() // settings.replica_refresh_seconds)
+                if slot != last_slot:
+                    last_slot = await asyncio.to_thread(schedule_replica_refresh, settings)
+            hour = int(time.time() // 3600)
+            if hour != last_purge_hour:
+                last_purge_hour = hour
+                await asyncio.to_thread(
+                    job_queue.enqueue, "purge_jobs", {"retention": settings.job_retention_seconds},
+                    idempotency_key=f"purge_jobs:{hour}",
+                )
+        except Exception as exc:
+            print(f"Maintenance tick failed: {exc!r}")
+        await asyncio.sleep(1)
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """Build the ASGI app without touching the database or filesystem.
+
+    Everything expensive (engine, password hasher, table creation, seeding) is
+    deferred to first use or the startup event, which runs in each worker after
+    fork, so `gunicorn --preload` shares no connections between processes.
+    """
+    settings = settings or Settings.from_env()
+    db.configure(settings)
+    if IMPORT_SECONDS * 1000 > settings.import_time_budget_ms:
+        print(f"Warning: backend.main took {IMPORT_SECONDS * 1000:.0f}ms to import "
+              f"(budget {settings.import_time_budget_ms}ms).")
+
+    app = FastAPI(title="101 Dress API")
+    app.state.settings = settings
+    # Set JOB_WORKERS=0 to leave the queue to a standalone `python -m backend.worker`
+    app.state.worker_pool = WorkerPool(job_queue, concurrency=settings.job_workers)
+    app.state.item_reads = SingleFlight(ttl=settings.read_cache_ttl, stale_ttl=settings.read_cache_stale)
+    app.state.user_reads = SingleFlight(ttl=settings.read_cache_ttl, stale_ttl=settings.read_cache_stale)
+    app.state.catalog = CatalogSnapshot(get_engine) if settings.catalog_snapshot else None
+
+    # Admission control for routes that burn bcrypt CPU or disk I/O. Catalog reads
+    # have no rule so they keep flowing while these are throttled or shed.
+    # Added before CORS so rejections still carry CORS headers.
+    app.add_middleware(
+        RateLimitMiddleware,
+        rules={
+            ("POST", "/api/auth/login"): RouteRule(route=Limit(rate=20, burst=40), per_ip=Limit(rate=0.5, burst=10)),
+            ("POST", "/api/auth/signup"): RouteRule(route=Limit(rate=5, burst=10), per_ip=Limit(rate=0.1, burst=5)),
+            # Uploads are anonymous, so there is no per-user bucket to apply
+            ("POST", "/api/upload"): RouteRule(route=Limit(rate=20, burst=40), per_ip=Limit(rate=1, burst=10)),
+            # Listing writes take the sqlite write lock; keyed per seller so one
+            # account can't flood it from many addresses
+            ("POST", "/api/items"): RouteRule(route=Limit(rate=20, burst=40), per_ip=Limit(rate=2, burst=20), per_user=Limit(rate=0.5, burst=10)),
+        },
+        max_in_flight=settings.max_in_flight,
+        trust_forwarded=settings.trust_proxy_headers,
+        identify=token_subject,
+    )
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    @app.on_event("startup")
+    def on_startup():
+        create_db_and_tables()
+        # Uploads are saved to frontend/public so Vite serves them in dev
+        settings.upload_dir.mkdir(parents=True, exist_ok=True)
+        with Session(get_engine()) as session:
+            if settings.seed:
+                seed_database(session)
+            ensure_seller_stats(session)
+        if settings.seed:
+            job_queue.enqueue("fix_existing_images")
+        if settings.read_replica_urls:
+            # Copy only once the seed and stats backfill are in; the shared key
+            # means one copy however many worker processes start together
+            schedule_replica_refresh(settings)
+        if app.state.catalog is not None:
+            app.state.catalog.rebuild()
+
+    @app.on_event("startup")
+    async def start_background_tasks():
+        if app.state.worker_pool.concurrency > 0:
+            app.state.worker_pool.start()
+        app.state.maintenance = asyncio.create_task(run_maintenance(app))
+
+    @app.on_event("shutdown")
+    async def stop_background_tasks():
+        app.state.maintenance.cancel()
+        await app.state.worker_pool.stop()
+
+    app.include_router(router)
+
+    # --- STATIC FILES (Served after API routes) ---
+    # Serve static files from the frontend build directory
+    if settings.frontend_dist.exists():
+        app.mount("/assets", StaticFiles(directory=settings.frontend_dist / "assets"), name="assets")
+        # SPA Catch-all
+        app.mount("/", StaticFiles(directory=settings.frontend_dist, html=True), name="frontend")
+    else:
+        print("Warning: frontend/dist not found. Run 'npm run build' in frontend directory.")
+
+    return app
+
+app = create_app()
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 8000))
     uvicorn.run(app, host="0.0.0.0", port=port)
-
-# --- STATIC FILES (Served after API routes) ---
-# Serve static files from the frontend build directory
-if os.path.exists("frontend/dist"):
-    app.mount("/assets", StaticFiles(directory="frontend/dist/assets"), name="assets")
-    # SPA Catch-all
-    app.mount("/", StaticFiles(directory="frontend/dist", html=True), name="frontend")
-else:
-    print("Warning: frontend/dist not found. Run 'npm run build' in frontend directory.")
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from sqlmodel import Field, Relationship, SQLModel
 import enum
 
@@ -77,3 +77,53 @@ class Order(SQLModel, table=True):
     item: Item = Relationship(back_populates="orders")
     buyer: User = Relationship(back_populates="buyer_orders", sa_relationship_kwargs={"foreign_keys": "Order.buyer_id"})
     seller: User = Relationship(back_populates="seller_orders", sa_relationship_kwargs={"foreign_keys": "Order.seller_id"})
+
+class SellerStats(SQLModel, table=True):
+    seller_id: str = Field(foreign_key="user.id", primary_key=True)
+    live_count: int = Field(default=0)
+    processing_count: int = Field(default=0)
+    rented_count: int = Field(default=0)
+    awaiting_pickup_count: int = Field(default=0)
+    active_rentals: int = Field(default=0)
+    escrow_held: float = Field(default=0.0)
+    lifetime_sales: int = Field(default=0)
+    lifetime_revenue: float = Field(default=0.0)
+
+class SellerDashboard(SQLModel):
+    seller_id: str
+    listings: Dict[ItemStatus, int]
+    total_listings: int
+    active_rentals: int
+    escrow_held: float
+    lifetime_sales: int
+    lifetime_revenue: float
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+class Job(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    kind: str = Field(index=True)
+    payload: str = Field(default="{}") # JSON
+    status: JobStatus = Field(default=JobStatus.QUEUED, index=True)
+    idempotency_key: Optional[str] = Field(default=None, unique=True)
+    attempts: int = Field(default=0)
+    max_attempts: int = Field(default=5)
+    run_at: float = Field(index=True) # epoch seconds; next time the job may be leased
+    leased_until: Optional[float] = None
+    leased_by: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    last_error: Optional[str] = None
+
+class Counter(SQLModel, table=True):
+    name: str = Field(primary_key=True)
+    value: int = Field(default=0)
+
+class CatalogChange(SQLModel, table=True):
+    seq: Optional[int] = Field(default=None, primary_key=True)
+    item_id: Optional[int] = None # None means "many rows changed, rebuild"
@@ -0,0 +1,179 @@
+import asyncio
+import json
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Limit:
+    rate: float  # tokens refilled per second
+    burst: int   # bucket capacity
+
+
+@dataclass(frozen=True)
+class RouteRule:
+    """Buckets applied to one expensive route. Any of them may be None."""
+    route: Optional[Limit] = None   # shared by every caller of the route
+    per_ip: Optional[Limit] = None
+    per_user: Optional[Limit] = None
+
+
+class TokenBuckets:
+    """Token buckets keyed by string, stored as `key -> [tokens, last_refill, refill_time]`.
+
+    Keys are kept in least-recently-used order. A bucket that has been idle long
+    enough to refill completely is indistinguishable from a fresh one, so those
+    are dropped from the cold end, and the table is capped at `max_keys`.
+    """
+
+    def __init__(self, max_keys: int = 50_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def take(self, key: str, limit: Limit, now: float) -> float:
+        """Consume one token. Returns 0 if allowed, else seconds until one is available."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(limit.burst), now, limit.burst / limit.rate]
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(limit.burst, bucket[0] + (now - bucket[1]) * limit.rate)
+            bucket[1] = now
+        self._evict(now)
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / limit.rate
+
+    def _evict(self, now: float):
+        # Only look at a couple of the coldest entries so each call stays O(1)
+        for _ in range(2):
+            if not self._buckets:
+                return
+            key, (tokens, last, refill_time) = next(iter(self._buckets.items()))
+            if now - last < refill_time and len(self._buckets) <= self.max_keys:
+                return
+            del self._buckets[key]
+
+
+class EventLoopLagMonitor:
+    """Samples how late the event loop wakes up from a short sleep."""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.lag = 0.0
+        self._task = None
+
+    def ensure_started(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            # Exponential moving average so one slow tick doesn't trip shedding
+            self.lag = 0.7 * self.lag + 0.3 * max(0.0, loop.time() - start - self.interval)
+
+
+class RateLimitMiddleware:
+    """ASGI middleware for admission control on expensive routes.
+
+    Requests matching a rule must get a token from each configured bucket or are
+    rejected with 429. When the process is overloaded (too many requests in flight
+    or event-loop lag above threshold) those routes are shed with 503 up front,
+    leaving capacity for the cheap catalog reads that have no rule.
+    """
+
+    def __init__(self, app, rules: Dict[Tuple[str, str], RouteRule], max_in_flight: int = 200,
+                 max_loop_lag: float = 0.25, max_keys: int = 50_000, trust_forwarded: bool = False,
+                 identify: Optional[Callable[[str], Optional[str]]] = None):
+        self.app = app
+        self.rules = rules
+        self.max_in_flight = max_in_flight
+        self.max_loop_lag = max_loop_lag
+        self.trust_forwarded = trust_forwarded
+        # bearer token -> user id, or None if the token doesn't verify
+        self.identify = identify
+        self.buckets = TokenBuckets(max_keys=max_keys)
+        self.lag_monitor = EventLoopLagMonitor()
+        self.in_flight = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        self.lag_monitor.ensure_started()
+
+        rule = self.rules.get((scope["method"], scope["path"]))
+        if rule is not None:
+            if self.in_flight >= self.max_in_flight or self.lag_monitor.lag >= self.max_loop_lag:
+                return await self._reject(send, 503, "Server busy, please retry shortly", 1.0)
+            retry_after = self._admit(scope, rule)
+            if retry_after:
+                return await self._reject(send, 429, "Too many requests", retry_after)
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+    def _admit(self, scope, rule: RouteRule) -> float:
+        now = time.monotonic()
+        route = f"{scope['method']} {scope['path']}"
+        checks = [(f"{route}|ip:{self._client_ip(scope)}", rule.per_ip)]
+        user = self._user_key(scope) if rule.per_user is not None else None
+        if user is not None:
+            checks.append((f"{route}|user:{user}", rule.per_user))
+        # Shared route bucket last, so a client over its own limit can't drain it
+        checks.append((route, rule.route))
+        for key, limit in checks:
+            if limit is not None:
+                wait = self.buckets.take(key, limit, now)
+                if wait:
+                    return wait
+        return 0.0
+
+    def _client_ip(self, scope) -> str:
+        if self.trust_forwarded:
+            # Our proxy appends the address it saw to whatever the client sent, so
+            # only the right-most entry is trustworthy; the rest are client-chosen
+            forwarded = [
+                part.strip()
+                for name, value in scope["headers"] if name == b"x-forwarded-for"
+                for part in value.decode("latin-1").split(",") if part.strip()
+            ]
+            if forwarded:
+                return forwarded[-1]
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def _user_key(self, scope) -> Optional[str]:
+        # Only verified tokens get a bucket of their own, otherwise every made-up
+        # token would be a fresh one
+        if self.identify is None:
+            return None
+        for name, value in scope["headers"]:
+            if name == b"authorization" and value[:7].lower() == b"bearer ":
+                return self.identify(value[7:].decode("latin-1"))
+        return None
+
+    async def _reject(self, send, status_code: int, detail: str, retry_after: float):
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,75 @@
+import json
+import os
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    return os.environ.get(name, "1" if default else "0").lower() in ("1", "true", "yes")
+
+
+def _env_list(name: str) -> Tuple[str, ...]:
+    return tuple(part.strip() for part in os.environ.get(name, "").split(",") if part.strip())
+
+
+@dataclass(frozen=True)
+class Settings:
+    database_url: str = "sqlite:///backend/database_v2.db" # Using v2 to avoid schema conflicts
+    db_pool_size: int = 5
+    db_pool_timeout: float = 30.0
+    read_replica_urls: Tuple[str, ...] = () # GET handlers read from these, writes go to database_url
+    replica_refresh_seconds: float = 30.0 # how often sqlite replicas are re-copied from the primary
+    config_file: Optional[Path] = None # JSON overrides, re-read while running when it changes
+    seed: bool = False # create demo users/items on an empty database
+    job_workers: int = 2 # 0 leaves the queue to a standalone `python -m backend.worker`
+    job_retention_seconds: float = 86400.0 # finished jobs are deleted after this long
+    max_in_flight: int = 200
+    trust_proxy_headers: bool = False # set behind one reverse proxy that appends to X-Forwarded-For
+    upload_dir: Path = Path("frontend/public/assets/uploads")
+    frontend_dist: Path = Path("frontend/dist")
+    import_time_budget_ms: int = 1500
+    read_cache_ttl: float = 1.0 # seconds a coalesced item/user read is reused
+    read_cache_stale: float = 0.0 # extra seconds served stale while refreshing
+    catalog_snapshot: bool = False # serve /api/items from the in-memory CatalogSnapshot
+    bulk_admin_emails: Tuple[str, ...] = () # users allowed to call /api/export and /api/import
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        settings = cls(
+            database_url=os.environ.get("DATABASE_URL", cls.database_url),
+            db_pool_size=int(os.environ.get("DB_POOL_SIZE", cls.db_pool_size)),
+            db_pool_timeout=float(os.environ.get("DB_POOL_TIMEOUT", cls.db_pool_timeout)),
+            read_replica_urls=_env_list("READ_REPLICA_URLS"),
+            replica_refresh_seconds=float(os.environ.get("REPLICA_REFRESH_SECONDS", cls.replica_refresh_seconds)),
+            config_file=Path(os.environ["CONFIG_FILE"]) if os.environ.get("CONFIG_FILE") else None,
+            seed=_env_flag("SEED_DB"),
+            job_workers=int(os.environ.get("JOB_WORKERS", cls.job_workers)),
+            job_retention_seconds=float(os.environ.get("JOB_RETENTION_SECONDS", cls.job_retention_seconds)),
+            max_in_flight=int(os.environ.get("MAX_IN_FLIGHT", cls.max_in_flight)),
+            trust_proxy_headers=_env_flag("TRUST_PROXY_HEADERS"),
+            import_time_budget_ms=int(os.environ.get("IMPORT_TIME_BUDGET_MS", cls.import_time_budget_ms)),
+            read_cache_ttl=float(os.environ.get("READ_CACHE_TTL", cls.read_cache_ttl)),
+            read_cache_stale=float(os.environ.get("READ_CACHE_STALE", cls.read_cache_stale)),
+            catalog_snapshot=_env_flag("CATALOG_SNAPSHOT"),
+            bulk_admin_emails=_env_list("BULK_ADMIN_EMAILS"),
+        )
+        return settings.with_config_file()
+
+    def with_config_file(self) -> "Settings":
+        """Overlay values from `config_file` (a JSON object keyed by field name)."""
+        if self.config_file is None or not self.config_file.exists():
+            return self
+        overrides = json.loads(self.config_file.read_text())
+        types = {field.name: type(getattr(self, field.name)) for field in fields(self)}
+        unknown = set(overrides) - set(types) - {"config_file"}
+        if unknown:
+            raise ValueError(f"Unknown settings in {self.config_file}: {', '.join(sorted(unknown))}")
+        coerced = {}
+        for name, value in overrides.items():
+            if name == "config_file":
+                continue
+            if types[name] is tuple and isinstance(value, str):
+                value = tuple(part.strip() for part in value.split(",") if part.strip())
+            coerced[name] = types[name](value)
+        return replace(self, **coerced)
@@ -0,0 +1,79 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Coalesces concurrent loads of the same key into one execution.
+
+    `load` is a blocking callable (a DB lookup) run in a worker thread; every
+    caller that arrives while it is in flight awaits the same result. Results
+    are kept for `ttl` seconds, and for a further `stale_ttl` seconds they are
+    served stale while a single background load refreshes them
+    (stale-while-revalidate). With both at 0 only in-flight loads are shared.
+    """
+
+    def __init__(self, ttl: float = 0.0, stale_ttl: float = 0.0, max_entries: int = 10_000):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._cache: "OrderedDict[Hashable, tuple]" = OrderedDict() # key -> (value, fresh_until)
+        self.executed = 0
+        self.coalesced = 0
+        self.hits = 0
+        self.stale_hits = 0
+
+    async def get(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        entry = self._cache.get(key)
+        if entry is not None:
+            value, fresh_until = entry
+            now = time.monotonic()
+            if now < fresh_until:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return value
+            if now < fresh_until + self.stale_ttl:
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    self._start(key, load)
+                return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = self._start(key, load)
+        # Shielded so one caller disconnecting doesn't cancel the load for the rest
+        return await asyncio.shield(task)
+
+    def _start(self, key: Hashable, load: Callable[[], Any]) -> asyncio.Task:
+        self.executed += 1
+        task = asyncio.get_running_loop().create_task(self._load(key, load))
+        # Background refreshes may have no awaiter; mark their errors as retrieved
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._inflight[key] = task
+        return task
+
+    async def _load(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        try:
+            value = await asyncio.to_thread(load)
+            if self.ttl > 0 or self.stale_ttl > 0:
+                self._cache[key] = (value, time.monotonic() + self.ttl)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+            return value
+        finally:
+            del self._inflight[key]
+
+    def metrics(self) -> dict:
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "in_flight": len(self._inflight),
+            "cached": len(self._cache),
+        }
@@ -0,0 +1,126 @@
+from collections import Counter, defaultdict
+from typing import List
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as postgres_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select, update
+from backend.models import Item, ItemStatus, Order, OrderStatus, SellerStats, SellerDashboard
+
+# Per-seller counters kept in step with Item/Order writes so the dashboard is a
+# single primary-key lookup. Every helper only stages changes on the caller's
+# session; they land in the same commit as the item/order write itself.
+
+def _status_column(status: ItemStatus) -> str:
+    return f"{ItemStatus(status).value}_count"
+
+def _holds_escrow(status: OrderStatus) -> bool:
+    return status != OrderStatus.CLOSED
+
+def _bump(session: Session, seller_id: str, **deltas):
+    """Apply `column += delta` for each keyword in a single UPDATE."""
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    # Insert-or-ignore rather than check-then-insert, so two first listings for
+    # the same seller at once can't collide on the primary key
+    dialect = session.get_bind().dialect.name
+    insert = postgres_insert if dialect == "postgresql" else sqlite_insert
+    session.exec(insert(SellerStats).values(seller_id=seller_id).on_conflict_do_nothing())
+    values = {column: getattr(SellerStats, column) + delta for column, delta in deltas.items()}
+    session.exec(
+        update(SellerStats)
+        .where(SellerStats.seller_id == seller_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+def _order_deltas(order: Order) -> dict:
+    return {
+        "active_rentals": 1 if order.status == OrderStatus.ACTIVE_RENTAL else 0,
+        "escrow_held": order.escrow_amount if _holds_escrow(order.status) else 0,
+    }
+
+def record_item_created(session: Session, item: Item):
+    _bump(session, item.seller_id, **{_status_column(item.status): 1})
+
+def record_order_created(session: Session, order: Order):
+    deltas = _order_deltas(order)
+    if order.type == "buy":
+        deltas["lifetime_sales"] = 1
+        deltas["lifetime_revenue"] = order.escrow_amount
+    _bump(session, order.seller_id, **deltas)
+
+def record_items_imported(session: Session, items: List[dict]):
+    """Bulk counterpart of record_item_created: one UPDATE per seller in the batch."""
+    deltas = defaultdict(Counter)
+    for item in items:
+        deltas[item["seller_id"]][_status_column(item.get("status") or ItemStatus.LIVE)] += 1
+    for seller_id, columns in deltas.items():
+        _bump(session, seller_id, **columns)
+
+def record_orders_imported(session: Session, orders: List[dict]):
+    deltas = defaultdict(Counter)
+    for order in orders:
+        columns = deltas[order["seller_id"]]
+        order_status = order.get("status") or OrderStatus.SHIPPED
+        if order_status == OrderStatus.ACTIVE_RENTAL:
+            columns["active_rentals"] += 1
+        if _holds_escrow(order_status):
+            columns["escrow_held"] += order["escrow_amount"]
+        if order["type"] == "buy":
+            columns["lifetime_sales"] += 1
+            columns["lifetime_revenue"] += order["escrow_amount"]
+    for seller_id, columns in deltas.items():
+        _bump(session, seller_id, **columns)
+
+def rebuild_seller_stats(session: Session):
+    """Recompute every seller's counters from the Item and Order tables.
+
+    Only needed to backfill databases created before SellerStats existed.
+    """
+    session.exec(SellerStats.__table__.delete())
+    stats = {}
+
+    def row(seller_id):
+        if seller_id not in stats:
+            stats[seller_id] = SellerStats(seller_id=seller_id)
+        return stats[seller_id]
+
+    item_counts = session.exec(
+        select(Item.seller_id, Item.status, func.count()).group_by(Item.seller_id, Item.status)
+    ).all()
+    for seller_id, item_status, count in item_counts:
+        column = _status_column(item_status)
+        setattr(row(seller_id), column, getattr(row(seller_id), column) + count)
+
+    for order in session.exec(select(Order)).all():
+        entry = row(order.seller_id)
+        if order.status == OrderStatus.ACTIVE_RENTAL:
+            entry.active_rentals += 1
+        if _holds_escrow(order.status):
+            entry.escrow_held += order.escrow_amount
+        if order.type == "buy":
+            entry.lifetime_sales += 1
+            entry.lifetime_revenue += order.escrow_amount
+
+    for entry in stats.values():
+        session.add(entry)
+
+def ensure_seller_stats(session: Session):
+    """Backfill the stats table once if it is empty but listings exist."""
+    if session.exec(select(SellerStats)).first() is None and session.exec(select(Item)).first() is not None:
+        rebuild_seller_stats(session)
+        session.commit()
+
+def get_dashboard(session: Session, seller_id: str) -> SellerDashboard:
+    stats = session.get(SellerStats, seller_id) or SellerStats(seller_id=seller_id)
+    listings = {status: getattr(stats, _status_column(status)) for status in ItemStatus}
+    return SellerDashboard(
+        seller_id=seller_id,
+        listings=listings,
+        total_listings=sum(listings.values()),
+        active_rentals=stats.active_rentals,
+        escrow_held=stats.escrow_held,
+        lifetime_sales=stats.lifetime_sales,
+        lifetime_revenue=stats.lifetime_revenue,
+    )
@@ -0,0 +1,80 @@
+"""The shared job queue and its handlers.
+
+Kept apart from backend.main so the standalone worker can register the
+handlers without building the API app.
+"""
+import time
+from sqlmodel import Session, delete, select, update
+from backend.catalog import prune_catalog_changes, record_catalog_change
+from backend.db import get_engine, refresh_replicas
+from backend.jobs import JobQueue, handler
+from backend.models import Item, Job, JobStatus
+
+job_queue = JobQueue(get_engine)
+
+
+@handler("fix_existing_images")
+def fix_existing_images(session: Session, payload: dict):
+    """Migrate remote images to local assets for performance"""
+    items = session.exec(select(Item)).all()
+    updates = {
+        "Acne": "/assets/items/acne-jacket.png",
+        "Balenciaga": "/assets/balenciaga_sneakers.png",
+        "Zimmermann": "/assets/ysl_sunset.png", # Fallback
+        "Gucci": "/assets/gucci_belt.png",
+        "Prada": "/assets/prada_cleo.png",
+        "YSL": "/assets/ysl_sunset.png",
+        "Chanel": "/assets/chanel_classic_flap.png"
+    }
+    for item in items:
+        changed = False
+        # Check for keyword matches
+        for key, path in updates.items():
+            if key.lower() in item.title.lower() and item.image != path:
+                item.image = path
+                changed = True
+                break
+
+        # General fallback for any remaining unsplash links
+        if not changed and "http" in item.image:
+            item.image = "/assets/prada_cleo.png"
+            changed = True
+
+        if changed:
+            session.add(item)
+            record_catalog_change(session, item.id)
+
+
+@handler("set_item_images")
+def set_item_images(session: Session, payload: dict):
+    """Point listings at new images; payload is {"images": {title: image path or URL}}."""
+    for title, image in payload["images"].items():
+        item = session.exec(select(Item).where(Item.title == title)).first()
+        if item is None:
+            print(f"Item not found: {title}")
+            continue
+        item.image = image
+        session.add(item)
+        record_catalog_change(session, item.id)
+
+
+@handler("refresh_replicas")
+def refresh_replicas_job(session: Session, payload: dict):
+    refresh_replicas()
+
+
+@handler("purge_jobs")
+def purge_jobs(session: Session, payload: dict):
+    """Hourly housekeeping: fail jobs whose last lease lapsed with no attempts
+    left, delete finished jobs older than `payload["retention"]` seconds and
+    prune the catalog change log."""
+    now = time.time()
+    session.exec(
+        update(Job)
+        .where(Job.status == JobStatus.RUNNING, Job.leased_until < now, Job.attempts >= Job.max_attempts)
+        .values(status=JobStatus.FAILED, finished_at=now, leased_until=None, last_error="Lease expired on the last attempt")
+    )
+    session.exec(
+        delete(Job).where(Job.status.in_([JobStatus.DONE, JobStatus.FAILED]), Job.finished_at < now - payload["retention"])
+    )
+    prune_catalog_changes(session)
@@ -0,0 +1,43 @@
+"""Standalone job worker.
+
+Run alongside the API (started with JOB_WORKERS=0) to drain the job queue in
+a separate process:
+
+    python -m backend.worker --concurrency 4
+    python -m backend.worker --enqueue fix_existing_images
+"""
+import argparse
+import asyncio
+import json
+from backend.db import create_db_and_tables
+from backend.jobs import WorkerPool
+from backend.tasks import job_queue # importing tasks also registers the job handlers
+
+
+async def run(concurrency: int):
+    pool = WorkerPool(job_queue, concurrency=concurrency)
+    pool.start()
+    print(f"Worker pool started with {concurrency} workers. Ctrl+C to stop.")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await pool.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="101 Dress background job worker")
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--enqueue", metavar="KIND", help="enqueue a job of this kind and exit")
+    parser.add_argument("--payload", default="{}", help="JSON payload for --enqueue")
+    parser.add_argument("--key", help="idempotency key for --enqueue")
+    args = parser.parse_args()
+
+    create_db_and_tables()
+    if args.enqueue:
+        job_id = job_queue.enqueue(args.enqueue, json.loads(args.payload), idempotency_key=args.key)
+        print(f"Enqueued job {job_id} ({args.enqueue})")
+    else:
+        try:
+            asyncio.run(run(args.concurrency))
+        except KeyboardInterrupt:
+            pass
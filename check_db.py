@@ -1,7 +1,8 @@
 import sqlite3
+from backend.db import sqlite_path
 import os
 
-db_path = 'backend/database_v2.db'
+db_path = sqlite_path() # DATABASE_URL, see backend/settings.py
 if os.path.exists(db_path):
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
@@ -1,7 +1,8 @@
 import sqlite3
+from backend.db import sqlite_path
 import os
 
-db_path = 'backend/database_v2.db'
+db_path = sqlite_path() # DATABASE_URL, see backend/settings.py
 print(f"Checking {db_path}...")
 if not os.path.exists(db_path):
     print("File does not exist!")
@@ -1,6 +1,8 @@
 import sqlite3
+from backend.db import create_db_and_tables, sqlite_path
 
-db_path = 'backend/database_v2.db'
+db_path = sqlite_path() # DATABASE_URL, see backend/settings.py
+create_db_and_tables() # older databases may predate the catalogchange table
 conn = sqlite3.connect(db_path)
 cursor = conn.cursor()
 
@@ -36,6 +38,9 @@ for item_id, title, current_image in items:
         print(f"Updating '{title}' \n  Old: {current_image}\n  New: {new_image}")
         cursor.execute("UPDATE item SET image = ? WHERE id = ?", (new_image, item_id))
 
+# Tell running catalog snapshots to reload (NULL item_id = many rows changed)
+cursor.execute("INSERT INTO catalogchange (item_id) VALUES (NULL)")
+
 conn.commit()
 print("Done. All remote images should now be local.")
 conn.close()
@@ -1,10 +1,10 @@
-from sqlmodel import Session, create_engine, select
+from sqlmodel import Session, select
+from backend.catalog import record_catalog_change
+from backend.db import get_engine
 from backend.models import Item
 
-# Database connection
-sqlite_file_name = "database_v2.db"
-sqlite_url = f"sqlite:///backend/{sqlite_file_name}"
-engine = create_engine(sqlite_url)
+# Database connection (DATABASE_URL, see backend/settings.py)
+engine = get_engine()
 
 def fix_ysl_image():
     with Session(engine) as session:
@@ -17,6 +17,7 @@ def fix_ysl_image():
             # Using the local file we just created
             item.image = "/assets/ysl_sunset.png"
             session.add(item)
+            record_catalog_change(session, item.id)
             session.commit()
             print("Successfully updated Saint Laurent Sunset Bag image!")
         else:
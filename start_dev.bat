@@ -7,6 +7,8 @@ echo.
 echo [1/2] Setting up and starting Backend...
 rem Installing dependencies silently
 pip install fastapi uvicorn sqlmodel python-jose[cryptography] passlib[bcrypt] python-multipart
+rem Seed demo data if the database is empty
+set SEED_DB=1
 rem Starting Backend on PORT 8001 to match Frontend config
 start "101-Dress Backend" cmd /k "python -m uvicorn backend.main:app --reload --port 8001"
 
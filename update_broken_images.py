@@ -1,11 +1,8 @@
-from sqlmodel import Session, create_engine, select
-from backend.models import Item
-
-# Database connection
-sqlite_file_name = "database_v2.db"
-sqlite_url = f"sqlite:///backend/{sqlite_file_name}"
-engine = create_engine(sqlite_url)
+from backend.db import create_db_and_tables
+from backend.tasks import job_queue
 
+# Runs as a background job (see backend/tasks.py); a worker in the API process
+# or `python -m backend.worker` applies it.
 def update_images():
     updates = {
         "Balenciaga Track Sneakers": "/assets/balenciaga_sneakers.png",
@@ -17,21 +14,9 @@ def update_images():
         "Celine Triomphe Sunglasses": "https://images.unsplash.com/photo-1572635196237-14b3f281503f?q=80&w=1000", # Sunglasses
     }
 
-    with Session(engine) as session:
-        for title, new_image_path in updates.items():
-            statement = select(Item).where(Item.title == title)
-            results = session.exec(statement)
-            item = results.first()
-
-            if item:
-                print(f"Updating {item.title}...")
-                item.image = new_image_path
-                session.add(item)
-            else:
-                print(f"Item not found: {title}")
-        
-        session.commit()
-        print("All images updated successfully!")
+    job_id = job_queue.enqueue("set_item_images", {"images": updates})
+    print(f"Enqueued {len(updates)} image updates as job {job_id}")
 
 if __name__ == "__main__":
+    create_db_and_tables()
     update_images()
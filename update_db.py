@@ -1,14 +1,18 @@
 import sqlite3
+from backend.db import create_db_and_tables, sqlite_path
 import os
 
-db_path = 'backend/database_v2.db'
+db_path = sqlite_path() # DATABASE_URL, see backend/settings.py
 if os.path.exists(db_path):
+    create_db_and_tables() # older databases may predate the catalogchange table
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     new_path = '/assets/items/acne-jacket.png'
     title = 'Acne Studios Leather Jacket'
     cursor.execute("UPDATE item SET image = ? WHERE title = ?", (new_path, title))
     if cursor.rowcount > 0:
+        # Tell running catalog snapshots to reload (NULL item_id = many rows changed)
+        cursor.execute("INSERT INTO catalogchange (item_id) VALUES (NULL)")
         print(f"Successfully updated image for '{title}' to '{new_path}'")
     else:
         print(f"No item found with title '{title}'")
@@ -1,10 +1,9 @@
-from sqlmodel import Session, create_engine, select
+from sqlmodel import Session, select
+from backend.db import get_engine
 from backend.models import User
 
-# Database connection
-sqlite_file_name = "database_v2.db"
-sqlite_url = f"sqlite:///backend/{sqlite_file_name}"
-engine = create_engine(sqlite_url)
+# Database connection (DATABASE_URL, see backend/settings.py)
+engine = get_engine()
 
 def update_user_name():
     with Session(engine) as session: